@@ -4,8 +4,18 @@ from lib.fonts import vga2_8x8 as font_256
 
 from lib import st7789py as st7789
 from lib.configs import tft_config
+from micropython import const
 import time
 
+# RGB565 colors from st7789py, folded into the bytecode by const()
+_BLACK  = const(0x0000)
+_RED    = const(0xF800)
+_YELLOW = const(0xFFE0)
+
+# vga1_8x8 glyph size
+_CHAR_W = const(8)
+_FONT_H = const(8)
+
 """
  test code for display. 
  call tft.reset_write_address() function to fix 
@@ -15,35 +25,43 @@ import time
 
 tft = tft_config.config(rotation=3)
 
+# ST7789 needs 120ms after a sleep in/out command before the next one
+_SLEEP_SETTLE_MS = const(120)
+_sleep_ready_ticks = time.ticks_ms()
+
 def panelSleep(sleep:bool): 
+    global _sleep_ready_ticks
 
     if sleep:
  
         tft._write(command=b'\x10') # sleep in
         print('panel sleep in')
-        time.sleep(3); 
     else: 
         tft._write(command=b'\x11') # sleep out
         print('panel sleep out')
-        time.sleep(3)
+    _sleep_ready_ticks = time.ticks_add(time.ticks_ms(), _SLEEP_SETTLE_MS)
+
+def panelReady(): 
+    """True once the panel has settled after the last panelSleep call."""
+    return time.ticks_diff(_sleep_ready_ticks, time.ticks_ms()) <= 0
 
 def displayMessage(): 
    # Clear screen
-    tft.fill(st7789.BLACK)
+    tft.fill(_BLACK)
 
     # Draw rectangle (x, y, width, height, color)
     x, y = tft.width // 2, 50
     w, h = 130, 40
-    tft.rect(x, y, w, h, st7789.RED)   # red border
+    tft.rect(x, y, w, h, _RED)   # red border
 
     # Fill inside rectangle
-    tft.fill_rect(x+1, y+1, w-2, h-2, st7789.YELLOW)
+    tft.fill_rect(x+1, y+1, w-2, h-2, _YELLOW)
 
     # Draw warning text centered inside
     msg = "WARNING!"
-    text_x = x + (w - len(msg) * 8) // 2   # each char is 8px wide in vga1_8x8
-    text_y = y + (h - 8) // 2              # font height is 8px
-    tft.text(font_128, msg, text_x, text_y, st7789.BLACK, st7789.YELLOW)
+    text_x = x + (w - len(msg) * _CHAR_W) // 2
+    text_y = y + (h - _FONT_H) // 2
+    tft.text(font_128, msg, text_x, text_y, _BLACK, _YELLOW)
 
 if __name__ == "__main__": 
     tft.reset_write_address()
\ No newline at end of file
@@ -1,8 +1,159 @@
 from lib import st7789py as st7789
 from lib.fonts import vga1_8x8
 from lib.configs import tft_config
+from core.display.font_cache import expand_row
+from micropython import const
+import framebuf
+import micropython
+import struct
 import time
 
+# RGB565 colors (values from st7789py)
+BLACK   = const(0x0000)
+BLUE    = const(0x001F)
+RED     = const(0xF800)
+GREEN   = const(0x07E0)
+CYAN    = const(0x07FF)
+MAGENTA = const(0xF81F)
+YELLOW  = const(0xFFE0)
+WHITE   = const(0xFFFF)
+
+# Largest single SPI transfer made by flush(), one DMA descriptor's worth
+_FLUSH_CHUNK = const(4092)
+
+
+def _swap565(color):
+    """Byte-swap an RGB565 color so framebuf stores it in panel (big-endian) order."""
+    return ((color & 0xFF) << 8) | (color >> 8)
+
+
+# Packed big-endian pixel bytes per color, seeded with the palette
+_color_bytes = {c: struct.pack('>H', c)
+                for c in (BLACK, BLUE, RED, GREEN, CYAN, MAGENTA, YELLOW, WHITE)}
+
+
+def color_bytes(color):
+    """Return the 2 byte panel encoding of an RGB565 color, memoized."""
+    packed = _color_bytes.get(color)
+    if packed is None:
+        packed = _color_bytes[color] = struct.pack('>H', color)
+    return packed
+
+
+@micropython.viper
+def _blit_glyph(dst: ptr8, offset: int, stride: int, glyph):
+    """Copy a pre-rendered 8 pixel wide glyph into the framebuffer at offset."""
+    src = ptr8(glyph)
+    size = int(len(glyph))
+    i = 0
+    while i < size:
+        dst[offset] = src[i]
+        dst[offset + 1] = src[i + 1]
+        dst[offset + 2] = src[i + 2]
+        dst[offset + 3] = src[i + 3]
+        dst[offset + 4] = src[i + 4]
+        dst[offset + 5] = src[i + 5]
+        dst[offset + 6] = src[i + 6]
+        dst[offset + 7] = src[i + 7]
+        dst[offset + 8] = src[i + 8]
+        dst[offset + 9] = src[i + 9]
+        dst[offset + 10] = src[i + 10]
+        dst[offset + 11] = src[i + 11]
+        dst[offset + 12] = src[i + 12]
+        dst[offset + 13] = src[i + 13]
+        dst[offset + 14] = src[i + 14]
+        dst[offset + 15] = src[i + 15]
+        offset += stride
+        i += 16
+
+
+@micropython.viper
+def _fill_row565(dst: ptr16, start: int, count: int, color: int):
+    """Write count pixels of an already byte-swapped color from pixel index start."""
+    end = start + count
+    while start < end:
+        dst[start] = color
+        start += 1
+
+
+class GlyphAtlas:
+    """
+    Cache of pre-rendered RGB565 glyphs for an 8 pixel wide bitmap font.
+
+    Each (foreground, background) color pair gets a table of glyph buffers
+    for the printable ASCII range. Glyphs, and the font rows they are made
+    of, are expanded the first time they are drawn, so a new color pair
+    costs nothing up front. Only the most recently used pairs are kept.
+
+    Args:
+        font (module): Bitmap font module (WIDTH, HEIGHT, FIRST, LAST, FONT)
+    """
+
+    FIRST = 32       # first cached character (space)
+    COUNT = 96       # printable ASCII characters
+    MAX_ENTRIES = 12 # color pairs kept, enough for the stock component styles
+
+    def __init__(self, font):
+        self.font = font
+        self._atlases = {}
+        self._order = []
+
+    def get(self, fg, bg):
+        """
+        Return the cache entry for a color pair, creating it on first use.
+
+        Returns:
+            list: [glyphs, rows, fg_bytes, bg_bytes], where glyphs holds one
+            slot per cached character and rows one per row pattern, both
+            None until expanded
+        """
+        key = (fg, bg)
+        entry = self._atlases.get(key)
+        if entry is None:
+            entry = [[None] * self.COUNT, [None] * 256,
+                     color_bytes(fg), color_bytes(bg)]
+            if len(self._order) >= self.MAX_ENTRIES:
+                del self._atlases[self._order.pop(0)]
+            self._atlases[key] = entry
+            self._order.append(key)
+        elif self._order[-1] != key:
+            self._order.remove(key)
+            self._order.append(key)
+        return entry
+
+    def expand(self, ch, entry):
+        """
+        Expand one character into RGB565 pixels.
+
+        Args:
+            ch (int): Character code
+            entry (list): Color pair entry from get()
+
+        Returns:
+            memoryview: WIDTH * HEIGHT * 2 bytes, None if the font lacks ch
+        """
+        font = self.font
+        if not font.FIRST <= ch < font.LAST:
+            return None
+
+        height = font.HEIGHT
+        bitmap = font.FONT
+        rows = entry[1]
+        fg_bytes = entry[2]
+        bg_bytes = entry[3]
+        glyph = bytearray(height * 16)
+        idx = (ch - font.FIRST) * height
+        pos = 0
+        for row in range(height):
+            bits = bitmap[idx + row]
+            pixels = rows[bits]
+            if pixels is None:
+                pixels = rows[bits] = expand_row(bits, fg_bytes, bg_bytes)
+            glyph[pos:pos + 16] = pixels
+            pos += 16
+        return memoryview(glyph)
+
+
 class DisplayManager:
     """
     Manages the TFT display and provides drawing utilities.
@@ -10,10 +161,16 @@ class DisplayManager:
     This class serves as the main interface to the ST7789 display driver,
     providing convenient methods for drawing shapes, text, and managing
     display operations.
+
+    Drawing primitives render into an RGB565 framebuffer kept in RAM.
+    Callers report the regions they touched with mark_dirty() and the
+    union of those regions is pushed to the panel by flush() in a single
+    blit_buffer() call.
     """
     
     # fonts
     FONT = vga1_8x8
+    _atlas = GlyphAtlas(vga1_8x8)
 
     # Color constants from st7789py
     BLACK   = st7789.BLACK
@@ -24,57 +181,246 @@ class DisplayManager:
     MAGENTA = st7789.MAGENTA
     YELLOW  = st7789.YELLOW
     WHITE   = st7789.WHITE
-   
+
+    # single shared instance, see __new__
+    _instance = None
+    display:st7789.ST7789 = None
+
+    # framebuffer backing store
+    fb_bytes:bytearray = None
+    fb:framebuf.FrameBuffer = None
+    _dirty = None  # (x0, y0, x1, y1) exclusive bounds, None when clean
+    _flush_buf = bytearray(_FLUSH_CHUNK)  # staging rows for partial-width flushes
+
+    def __new__(cls, rotation=0):
+        # There is one panel, so every DisplayManager() shares one instance
+        if cls._instance is None:
+            cls._instance = object.__new__(cls)
+        return cls._instance
 
     def __init__(self, rotation=0):
         """
         Initialize the display manager.
 
+        The panel and framebuffer are only set up on the first call; later
+        calls reuse them and only apply a rotation change.
+
         Args:
             rotation (int): Display rotation (0-3)
         """
-        DisplayManager.display:st7789.ST7789 = tft_config.config(rotation=rotation)
+        if DisplayManager.display is None:
+            DisplayManager.display = tft_config.config(rotation=rotation)
+        elif rotation != self.rotation:
+            self.display.rotation(rotation)
+        else:
+            return
+
         self.rotation = rotation
         self.width = self.display.width
         self.height = self.display.height
 
+        # RGB565 backing store, pushed to the panel by flush()
+        DisplayManager.fb_bytes = bytearray(self.width * self.height * 2)
+        DisplayManager.fb = framebuf.FrameBuffer(
+            self.fb_bytes, self.width, self.height, framebuf.RGB565
+        )
+        DisplayManager._dirty = None
+
         # Clear display on initialization
         self.display.reset_write_address()
     
     def __repr__(self): 
         attrs = ", ".join(f"{k}={v!r}" for k, v in self.__dict__.items())
         return f"{self.__class__.__name__}({attrs})"
+
+    def batched(self):
+        """
+        Group drawing outside Screen.draw into a single panel update.
+
+        Usage:
+            with display.batched():
+                component.draw()
+        """
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
  
     @classmethod
     def clear(cls, color=None):
         """Clear the display with specified color."""
-        fill_color = color if color is not None else cls.BLACK
-        cls.display.fill(fill_color)
+        fill_color = color if color is not None else BLACK
+        cls.fb.fill(_swap565(fill_color))
+        cls.mark_dirty(0, 0, cls.display.width, cls.display.height)
 
     @classmethod
+    @micropython.native
     def draw_text(cls, text, x, y, color=None, bg_color=None):
         """Draw text at specified position."""
-        text_color = color if color is not None else cls.WHITE
-        background = bg_color if bg_color is not None else cls.BLACK
-        cls.display.text(cls.FONT, text, x, y, text_color, background)
+        text_color = color if color is not None else WHITE
+        background = bg_color if bg_color is not None else BLACK
+
+        width = cls.display.width
+        font_height = cls.FONT.HEIGHT
+        if y < 0 or y + font_height > cls.display.height:
+            return
+
+        atlas = cls._atlas
+        entry = atlas.get(text_color, background)
+        glyphs = entry[0]
+        first = atlas.FIRST
+        count = atlas.COUNT
+        fb = cls.fb_bytes
+        stride = width * 2
+
+        for char in text:
+            if x < 0 or x + 8 > width:
+                break
+            code = ord(char)
+            index = code - first
+            if 0 <= index < count:
+                glyph = glyphs[index]
+                if glyph is None:
+                    glyph = glyphs[index] = atlas.expand(code, entry)
+            else:
+                glyph = atlas.expand(code, entry)
+            if glyph is None:
+                continue  # Not in the font
+
+            _blit_glyph(fb, (y * width + x) * 2, stride, glyph)
+            x += 8
 
     @classmethod
     def draw_rect(cls, x, y, width, height, color, filled=False):
         """Draw a rectangle."""
-        if filled:
-            cls.display.fill_rect(x, y, width, height, color)
-        else:
-            cls.display.rect(x, y, width, height, color)
+        if not filled:
+            cls.fb.rect(x, y, width, height, _swap565(color))
+            return
+
+        # Clip to the screen, then fill row by row
+        screen_w = cls.display.width
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + width, screen_w)
+        y1 = min(y + height, cls.display.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        fb = cls.fb_bytes
+        count = x1 - x0
+        color = _swap565(color)
+        start = y0 * screen_w + x0
+        for _ in range(y1 - y0):
+            _fill_row565(fb, start, count, color)
+            start += screen_w
+
+    @staticmethod
+    def get_color_bytes(color):
+        """Return the cached 2 byte panel encoding of a color."""
+        return color_bytes(color)
+
+    @classmethod
+    def fill_rows(cls, x, y, row, height):
+        """
+        Fill a rectangle by copying a pre-packed row of big-endian RGB565 pixels.
+
+        Args:
+            x (int): X coordinate
+            y (int): Y coordinate
+            row (bytes): One row of pixels, e.g. get_color_bytes(color) * width
+            height (int): Number of rows to fill
+        """
+        screen_w = cls.display.width
+        width = len(row) >> 1
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + width, screen_w)
+        y1 = min(y + height, cls.display.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        if x0 != x or x1 != x + width:
+            row = memoryview(row)[(x0 - x) * 2:(x1 - x) * 2]
+        fb = cls.fb_bytes
+        size = len(row)
+        stride = screen_w * 2
+        start = (y0 * screen_w + x0) * 2
+        for _ in range(y1 - y0):
+            fb[start:start + size] = row
+            start += stride
+
+    @classmethod
+    def draw_framed_rect(cls, x, y, width, height, fill_color, border_color):
+        """Draw a filled rectangle with a 1 pixel border, writing each pixel once."""
+        cls.draw_rect(x + 1, y + 1, width - 2, height - 2, fill_color, filled=True)
+        cls.fb.rect(x, y, width, height, _swap565(border_color))
 
     @classmethod
     def draw_line(cls, x0, y0, x1, y1, color):
         """Draw a line between two points."""
-        cls.display.line(x0, y0, x1, y1, color)
+        cls.fb.line(x0, y0, x1, y1, _swap565(color))
 
     @classmethod
     def draw_pixel(cls, x, y, color):
         """Draw a single pixel."""
-        cls.display.pixel(x, y, color)
+        cls.fb.pixel(x, y, _swap565(color))
+
+    @classmethod
+    def mark_dirty(cls, x, y, width, height):
+        """Add a region to the area pushed to the panel on the next flush."""
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + width, cls.display.width)
+        y1 = min(y + height, cls.display.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        dirty = cls._dirty
+        if dirty is None:
+            cls._dirty = (x0, y0, x1, y1)
+        else:
+            cls._dirty = (min(x0, dirty[0]), min(y0, dirty[1]),
+                          max(x1, dirty[2]), max(y1, dirty[3]))
+
+    @classmethod
+    def flush(cls):
+        """Push the dirty region of the framebuffer to the panel."""
+        dirty = cls._dirty
+        if dirty is None:
+            return
+        cls._dirty = None
+
+        x0, y0, x1, y1 = dirty
+        width = x1 - x0
+        stride = cls.display.width * 2
+        row_bytes = width * 2
+        fb = memoryview(cls.fb_bytes)
+        blit = cls.display.blit_buffer
+
+        # Send the region in bands of whole rows, each at most _FLUSH_CHUNK
+        # bytes, so no transfer or staging buffer grows with the region
+        band = max(1, _FLUSH_CHUNK // row_bytes)
+
+        if width == cls.display.width:
+            # Full-width rows are contiguous in the framebuffer
+            for y in range(y0, y1, band):
+                rows = min(band, y1 - y)
+                blit(fb[y * stride:(y + rows) * stride], 0, y, width, rows)
+            return
+
+        buffer = memoryview(cls._flush_buf)
+        for y in range(y0, y1, band):
+            rows = min(band, y1 - y)
+            src = y * stride + x0 * 2
+            dst = 0
+            for _ in range(rows):
+                buffer[dst:dst + row_bytes] = fb[src:src + row_bytes]
+                src += stride
+                dst += row_bytes
+            blit(buffer[:dst], x0, y, width, rows)
 
     @classmethod
     def get_text_width(cls, text):
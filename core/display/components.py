@@ -1,6 +1,98 @@
 import time 
-from core.display.base import DisplayManager
-class UIComponent:
+from array import array
+from machine import Timer
+from core.display.base import (DisplayManager, BLACK, BLUE, RED, GREEN, CYAN,
+                               MAGENTA, YELLOW, WHITE)
+from micropython import const
+import micropython
+
+_TEXT_INSET = const(4)  # Left padding before text in lists and inputs
+_ROW_PAD    = const(4)  # Vertical padding added to each list row
+
+_BLINK_TIMER = const(0)    # Hardware timer driving the cursor blink
+_BLINK_MS    = const(500)  # Cursor blink half-period
+_PRESS_MS    = const(200)  # How long a button shows its pressed state
+
+_ASCII_END   = const(0x80)  # TextInput holds ASCII only, one byte per glyph
+_NON_ASCII   = const(0x3F)  # '?' stands in for anything outside it
+
+DEBUG = const(0)  # Set to 1 to type-check component arguments
+
+# Virtual keyboard key kinds
+_KEY_NORMAL  = const(0)
+_KEY_SPECIAL = const(1)  # DEL, ENTER, SPACE
+_KEY_CAPS    = const(2)
+
+
+def _union(a, b):
+    """Bounding box of two (x, y, width, height) rects."""
+    x0 = min(a[0], b[0])
+    y0 = min(a[1], b[1])
+    x1 = max(a[0] + a[2], b[0] + b[2])
+    y1 = max(a[1] + a[3], b[1] + b[3])
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+class Drawable:
+    """
+    Screen bookkeeping shared by everything a Screen draws.
+
+    Keeps the owning screen's dirty count and flags in step with the dirty
+    flag, and provides the focus, invalidate and tick hooks Screen calls.
+    """
+
+    _screen = None  # Screen that tracks this component's dirty state
+    _idx = -1       # Position in the screen's component list
+
+    def set_focus(self, focused):
+        """Set component focus state."""
+        if self.focused != focused:
+            self.focused = focused
+            self._mark_dirty()
+            self.visible = True
+
+    def invalidate(self, rect=None):
+        """
+        Force a repaint on the next draw.
+
+        Args:
+            rect (tuple): Spoiled (x, y, width, height) area, None for all.
+                Components that can repaint part of themselves use it.
+        """
+        self._mark_dirty()
+
+    def pending_rect(self):
+        """
+        Area the next draw will repaint, as (x, y, width, height).
+
+        Components that repaint only part of themselves narrow it.
+        """
+        return (self.x, self.y, self.width, self.height)
+
+    def tick(self):
+        """Periodic work between redraws. Override in subclasses."""
+        pass
+
+    def _mark_dirty(self):
+        """Flag for redraw, keeping the owning screen's dirty count in step."""
+        if not self.dirty:
+            self.dirty = True
+            screen = self._screen
+            if screen is not None:
+                screen._dirty_count += 1
+                screen._dirty_flags[self._idx] = 1
+
+    def _mark_clean(self):
+        """Clear the redraw flag after drawing."""
+        if self.dirty:
+            self.dirty = False
+            screen = self._screen
+            if screen is not None:
+                screen._dirty_count -= 1
+                screen._dirty_flags[self._idx] = 0
+
+
+class UIComponent(Drawable):
     """
     Base class for all UI components.
     
@@ -31,19 +123,20 @@ class UIComponent:
     width:int = 0
     x:int = 0
     y:int = 0
+    dirty:bool = True
 
     callback = None
 
     # colors
 
-    BLACK   = DisplayManager.BLACK
-    BLUE    = DisplayManager.BLUE
-    RED     = DisplayManager.RED
-    GREEN   = DisplayManager.GREEN
-    CYAN    = DisplayManager.CYAN
-    MAGENTA = DisplayManager.MAGENTA
-    YELLOW  = DisplayManager.YELLOW
-    WHITE   = DisplayManager.WHITE
+    BLACK   = BLACK
+    BLUE    = BLUE
+    RED     = RED
+    GREEN   = GREEN
+    CYAN    = CYAN
+    MAGENTA = MAGENTA
+    YELLOW  = YELLOW
+    WHITE   = WHITE
 
     # button
     border_color = MAGENTA
@@ -68,46 +161,47 @@ class UIComponent:
         UIComponent._counter += 1 
         self.uid = UIComponent._counter
  
-        # check and set required arguments
-        for reqr, typr in self._required.items():
-            try:
-                kval = kwargs[reqr]
-            except Exception as e:
-                raise ValueError(f"({e}) Missing required parameters: <{reqr}>")            
-
-            if typr == callable:
-                if not callable(kval):
-                    raise TypeError(f"Parameter <{reqr}> must be callable, got {type(kval)}")
-            else:
-                if not isinstance(kval, typr):
-                    raise TypeError(f"Parameter <{reqr}> has invalid type: {type(kval)}")
+        if DEBUG:
+            # check and set required arguments
+            for reqr, typr in self._required.items():
+                try:
+                    kval = kwargs[reqr]
+                except Exception as e:
+                    raise ValueError(f"({e}) Missing required parameters: <{reqr}>")            
+
+                if typr == callable:
+                    if not callable(kval):
+                        raise TypeError(f"Parameter <{reqr}> must be callable, got {type(kval)}")
+                else:
+                    if not isinstance(kval, typr):
+                        raise TypeError(f"Parameter <{reqr}> has invalid type: {type(kval)}")
       
-            setattr(self, reqr, kval)
+                setattr(self, reqr, kval)
+        else:
+            # set required arguments, a missing one raises KeyError
+            for reqr in self._required:
+                setattr(self, reqr, kwargs[reqr])
+
+        # Bind drawing entry points once instead of on every draw
+        display = self.display
+        self._draw_rect = display.draw_rect
+        self._draw_framed_rect = display.draw_framed_rect
+        self._draw_text = display.draw_text
+        self._tw = display.get_text_width
+        self._th = display.get_text_height()
  
         self.visible = True
         self.dirty = True
         self.focused = True
 
     def __repr__(self):
-        try:
-            attrs = self.__dict__
-            id = str(self.uid)
-            attrs = ", ".join(f"{k}={v!r}" for k, v in attrs.items())
-            return f"{self.__class__.__name__}({attrs + ", id=" + id})"
-        except Exception as e:
-            print(e)
- 
-    def set_focus(self, focused):
-        """Set component focus state."""
-        if self.focused != focused:
-            self.focused = focused
-            self.dirty = True
-            self.visible = True
+        return f"{type(self).__name__}(uid={self.uid}, x={self.x}, y={self.y})"
  
     def contains_point(self, x, y):
         """Check if point is within component bounds."""
-        return (self.x <= x < self.x + self.width and 
-                self.y <= y < self.y + self.height)
+        dx = x - self.x
+        dy = y - self.y
+        return 0 <= dx < self.width and 0 <= dy < self.height
 
 
     def handle_encoder_rotation(self, direction, steps):
@@ -144,57 +238,71 @@ class Button(UIComponent):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)  
         self.pressed = False
+        self._release_at = 0  # ticks_ms deadline for clearing pressed, see tick
+        # text was assigned before the geometry, so place it again now
+        self._place_text()
+
+        # (border, text, background) for the normal, focused and pressed states
+        self._styles = (
+            (self.border_color, self.text_color, self.bg_color),
+            (self.focus_color, self.focus_color, self.bg_color),
+            (self.press_color, BLACK, self.press_color),
+        )
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        # Measure the label once per assignment instead of on every draw
+        self._text = value
+        self._text_width = len(value) * DisplayManager.FONT.WIDTH
+        self._place_text()
+        self._mark_dirty()
+
+    def _place_text(self):
+        """Center the label inside the button."""
+        self._text_xy = (self.x + ((self.width - self._text_width) >> 1),
+                         self.y + ((self.height - DisplayManager.FONT.HEIGHT) >> 1))
   
     def draw(self):
         """Draw the button with current state."""
-        if not self.visible:
+        if not self.visible or not self.dirty:
             return
         
         # Determine colors based on state
-        if self.pressed:
-            border = self.press_color
-            text_col = self.display.BLACK
-            bg = self.press_color
-        elif self.focused:
-            border = self.focus_color
-            text_col = self.focus_color
-            bg = self.bg_color
-        else:
-            border = self.border_color
-            text_col = self.text_color
-            bg = self.bg_color
-        
-        # Draw button background
-        self.display.draw_rect(self.x, self.y, self.width, self.height, 
-                                  bg, filled=True)
-        
-        # Draw border
-        self.display.draw_rect(self.x, self.y, self.width, self.height, border)
+        border, text_col, bg = self._styles[2 if self.pressed else 1 if self.focused else 0]
         
-        # Center and draw text
-        text_width = self.display.get_text_width(self.text)
-        text_height = self.display.get_text_height()
-        text_x = self.x + (self.width - text_width) // 2
-        text_y = self.y + (self.height - text_height) // 2
+        # Draw button background and border
+        self._draw_framed_rect(self.x, self.y, self.width, self.height, bg, border)
         
-        self.display.draw_text(self.text, text_x, text_y, text_col, bg)
+        # Draw the centered text
+        text_x, text_y = self._text_xy
+        self._draw_text(self._text, text_x, text_y, text_col, bg)
         
-        self.dirty = False
+        self.display.mark_dirty(self.x, self.y, self.width, self.height)
+        self._mark_clean()
 
     def handle_button_press(self, button_name, press_type):
         """Handle button press events."""
         if button_name == 'encoder' and press_type == 'short':
+            # Screen.update paints the pressed look right after the callbacks,
+            # repainting anything stacked above the button as well
             self.pressed = True
-            self.dirty = True
-            self.draw()  # Immediate visual feedback
+            self._mark_dirty()
             
             # Execute callback if
             self.callback()
                         
-            # Reset pressed state after short delay
-            time.sleep_ms(200)
+            # tick() resets the pressed state once the delay has passed
+            self._release_at = time.ticks_add(time.ticks_ms(), _PRESS_MS)
+
+    def tick(self):
+        """Release the pressed look once its delay has passed."""
+        if self.pressed and time.ticks_diff(time.ticks_ms(), self._release_at) >= 0:
             self.pressed = False
-            self.dirty = True
+            self._mark_dirty()
 
 class ListView(UIComponent):
     """
@@ -224,54 +332,120 @@ class ListView(UIComponent):
         
         self.selected_index = 0
         self.scroll_offset = 0
-        self.item_height = self.display.get_text_height() + 4  # Text height + padding
-        self.visible_items = self.height // self.item_height
+        self.item_height = self._th + _ROW_PAD  # Text height + padding
+        # Only rows whose text clears the bottom border are shown, so a row
+        # repaint never draws over the border. Rows start 2px below the top
+        # and text sits _ROW_PAD / 2 into its row.
+        self.visible_items = max(
+            0, (self.height - 3 - (_ROW_PAD >> 1) - self._th) // self.item_height + 1)
+        self._item_inner_width = self.width - 2
+        # Row backgrounds packed once so each row is a plain byte copy
+        color_bytes = self.display.get_color_bytes
+        self._row_fill_sel = color_bytes(self.selected_bg) * self._item_inner_width
+        self._row_fill_bg = color_bytes(self.bg_color) * self._item_inner_width
+
+        # State at the last draw, used to repaint only the rows that changed
+        self._prev_selected = -1
+        self._prev_scroll = -1
+        self._prev_items = None
  
     def set_items(self, items):
         """Set the list items."""
         self.items = items
         self.selected_index = 0
         self.scroll_offset = 0
-        self.dirty = True
+        # The list may be the same object mutated in place, so repaint it all
+        self.invalidate()
  
+    def invalidate(self, rect=None):
+        """Force a complete repaint on the next draw."""
+        self._prev_scroll = -1
+        self._mark_dirty()
+
+    def _same_viewport(self):
+        """True when the last draw showed the same items and scroll position."""
+        return (self._prev_scroll == self.scroll_offset
+                and self._prev_items is self.items)
+
+    def pending_rect(self):
+        """Area the next draw will repaint: the changed rows, or everything."""
+        if not self._same_viewport():
+            return (self.x, self.y, self.width, self.height)
+        old_row = self._prev_selected - self.scroll_offset
+        new_row = self.selected_index - self.scroll_offset
+        rect = self._row_rect(new_row)
+        if old_row != new_row and 0 <= old_row < self.visible_items:
+            rect = _union(rect, self._row_rect(old_row))
+        return rect
+
     def draw(self):
         """Draw the list view."""
-        if not self.visible:
+        if not self.visible or not self.dirty:
             return
-        
-        # Clear background
-        self.display.draw_rect(self.x, self.y, self.width, self.height, self.bg_color, filled=True)
-        
-        # Draw border
-        self.display.draw_rect(self.x, self.y, self.width, self.height, self.border_color)
+
+        if self._same_viewport():
+            # Same viewport: only the old and new selection rows changed
+            old_row = self._prev_selected - self.scroll_offset
+            new_row = self.selected_index - self.scroll_offset
+            if old_row != new_row and 0 <= old_row < self.visible_items:
+                self._draw_row(old_row, False)
+            self._draw_row(new_row, True)
+        else:
+            self._draw_full()
+
+        self._prev_selected = self.selected_index
+        self._prev_scroll = self.scroll_offset
+        self._prev_items = self.items
+        self._mark_clean()
+
+    def _draw_full(self):
+        """Repaint background, border and every visible row."""
+        # Clear background and draw border
+        self._draw_framed_rect(self.x, self.y, self.width, self.height,
+                               self.bg_color, self.border_color)
         
         # Draw items
-        for i in range(self.visible_items):
-            item_index = self.scroll_offset + i
-            if item_index >= len(self.items):
-                break
-            
-            item_y = self.y + 2 + (i * self.item_height)
-            item_text = self.items[item_index]
-            
-            # Check if this item is selected
-            if item_index == self.selected_index:
-                # Draw selection background
-                self.display.draw_rect(self.x + 1, item_y, 
-                                          self.width - 2, self.item_height,
-                                          self.selected_bg, filled=True)
-                text_color = self.selected_text
-                bg_color = self.selected_bg
-            else:
-                text_color = self.text_color
-                bg_color = self.bg_color
-            
-            # Draw item text
-            text_x = self.x + 4
-            self.display.draw_text(item_text, text_x, item_y + 2, 
-                                     text_color, bg_color)
-        
-        self.dirty = False
+        draw_row = self._draw_row
+        selected_row = self.selected_index - self.scroll_offset
+        for i in range(min(self.visible_items, len(self.items) - self.scroll_offset)):
+            draw_row(i, i == selected_row)
+
+        self.display.mark_dirty(self.x, self.y, self.width, self.height)
+
+    @micropython.native
+    def _draw_row(self, row, selected):
+        """
+        Draw one visible row.
+
+        Args:
+            row (int): Row index relative to the scroll offset
+            selected (bool): Draw with the selection colors
+        """
+        item_index = self.scroll_offset + row
+        row_x, item_y, row_width, row_height = self._row_rect(row)
+
+        if selected:
+            text_color = self.selected_text
+            bg_color = self.selected_bg
+            row_fill = self._row_fill_sel
+        else:
+            text_color = self.text_color
+            bg_color = self.bg_color
+            row_fill = self._row_fill_bg
+
+        self.display.fill_rows(row_x, item_y, row_fill, row_height)
+        if item_index < len(self.items):
+            self._draw_text(self.items[item_index], self.x + _TEXT_INSET, item_y + (_ROW_PAD >> 1),
+                            text_color, bg_color)
+
+        self.display.mark_dirty(row_x, item_y, row_width, row_height)
+
+    def _row_rect(self, row):
+        """Screen area of one visible row, inside the border."""
+        item_y = self.y + 2 + (row * self.item_height)
+        # Keep the row background inside the bottom border
+        row_height = min(self.item_height, self.y + self.height - 1 - item_y)
+        return (self.x + 1, item_y, self._item_inner_width, row_height)
     
     def handle_encoder_rotation(self, direction, steps):
         """Handle encoder rotation for scrolling."""
@@ -293,7 +467,7 @@ class ListView(UIComponent):
             self.scroll_offset = self.selected_index - self.visible_items + 1
         
         if old_selected != self.selected_index:
-            self.dirty = True
+            self._mark_dirty()
     
     def handle_button_press(self, button_name, press_type):
         """Handle button press for item selection."""
@@ -312,7 +486,8 @@ class TextInput(UIComponent):
     Text input UI component with placeholder support.
     
     Provides text input capability with placeholder text display
-    and cursor indication for active input state.
+    and cursor indication for active input state. Text is ASCII only,
+    other characters are stored as '?'.
 
     Args:
         display (DisplayManager): Display manager instance
@@ -327,57 +502,141 @@ class TextInput(UIComponent):
     _required.update({
         "placeholder" : str
     })
+
+    # One timer blinks every input; tick() follows its phase
+    _blink_timer = None
+    _blink_on = True
     
     def __init__(self, **kwargs):
  
         super().__init__(**kwargs)
-        self.text = ""
         self.cursor_visible = True
-        self.cursor_blink_time = 0
-        self.max_chars = (self.width - 8) // self.display.FONT.WIDTH  # Account for padding
+        if TextInput._blink_timer is None:
+            TextInput._blink_timer = Timer(_BLINK_TIMER, mode=Timer.PERIODIC,
+                                           period=_BLINK_MS, callback=TextInput._blink)
+        self.max_chars = (self.width - 2 * _TEXT_INSET) // self.display.FONT.WIDTH  # Account for padding
+        self._text_y = self.y + ((self.height - self._th) >> 1)
+
+        # Text is edited in place in a fixed buffer, so typing allocates nothing
+        self._buf = bytearray(self.max_chars)
+        self._len = 0
+        self._text_width = 0
+
+        # Length and focus as last painted; -1 forces a full repaint
+        self._drawn_len = -1
+        self._drawn_focus = False
+
+    @property
+    def text(self):
+        return bytes(self._buf[:self._len]).decode()
+
+    @text.setter
+    def text(self, value):
+        # One byte per character, so the length, the width and the decode in
+        # the getter stay in step; the width keeps the cursor unmeasured
+        value = value[:self.max_chars]
+        buf = self._buf
+        for i in range(len(value)):
+            code = ord(value[i])
+            buf[i] = code if code < _ASCII_END else _NON_ASCII
+        self._len = len(value)
+        self._text_width = self._len * DisplayManager.FONT.WIDTH
  
     def set_text(self, text):
         """Set the input text."""
         self.text = text[:self.max_chars]
-        self.dirty = True
+        self._drawn_len = -1
+        self._mark_dirty()
     
     def get_text(self):
         """Get the current text."""
         return self.text
     
     def append_char(self, char):
-        """Append a character to the text."""
-        if len(self.text) < self.max_chars:
-            self.text += char
-            self.dirty = True
+        """Append a character to the text, '?' if it is not ASCII."""
+        if self._len < self.max_chars:
+            code = ord(char)
+            self._buf[self._len] = code if code < _ASCII_END else _NON_ASCII
+            self._len += 1
+            self._text_width += DisplayManager.FONT.WIDTH
+            self._mark_dirty()
     
     def backspace(self):
         """Remove the last character."""
-        if self.text:
-            self.text = self.text[:-1]
-            self.dirty = True
+        if self._len:
+            self._len -= 1
+            self._text_width -= DisplayManager.FONT.WIDTH
+            self._mark_dirty()
     
     def draw(self):
         """Draw the text input."""
-        if not self.visible:
+        if not self.visible or not self.dirty:
             return
         
+        drawn = self._drawn_len
+        if self._tail_only():
+            # Typing only touches the characters after the shorter text
+            self._draw_tail(drawn)
+        else:
+            self._draw_body()
+            if self._cursor_enabled():
+                self._draw_cursor(self.cursor_visible)
+            self.display.mark_dirty(self.x, self.y, self.width, self.height)
+        
+        self._drawn_len = self._len
+        self._drawn_focus = self.focused
+        self._mark_clean()
+
+    def invalidate(self, rect=None):
+        """Force a complete repaint on the next draw."""
+        self._drawn_len = -1
+        self._mark_dirty()
+
+    def _tail_only(self):
+        """True when the next draw only has to repaint the end of the text."""
+        return self._drawn_len > 0 and self._len and self._drawn_focus == self.focused
+
+    def pending_rect(self):
+        """Area the next draw will repaint: the changed tail, or everything."""
+        if self._tail_only():
+            return self._tail_rect(self._drawn_len)
+        return (self.x, self.y, self.width, self.height)
+
+    @staticmethod
+    def _blink(timer):
+        """Timer callback: flip the cursor phase, drawing is left to tick()."""
+        TextInput._blink_on = not TextInput._blink_on
+
+    def tick(self):
+        """Blink the cursor, repainting only the cursor column."""
+        blink_on = TextInput._blink_on
+        if blink_on == self.cursor_visible:
+            return
+        if not self.visible or not self._cursor_enabled():
+            return
+
+        self.cursor_visible = blink_on
+        self._draw_cursor(blink_on)
+        self.display.mark_dirty(self._cursor_x(), self._text_y, 1, self._th)
+
+    def _cursor_enabled(self):
+        """Cursor shows when focused and text is not empty or no placeholder."""
+        return self.focused and (self._len or not self.placeholder)
+
+    def _cursor_x(self):
+        return self.x + _TEXT_INSET + self._text_width
+
+    def _draw_body(self):
+        """Draw background, border and text or placeholder."""
         # Determine border color
         border = self.focus_border if self.focused else self.border_color
         
-        # Clear background
-        self.display.draw_rect(self.x, self.y, self.width, self.height,
-                                  self.bg_color, filled=True)
-        
-        # Draw border
-        self.display.draw_rect(self.x, self.y, self.width, self.height, border)
-        
-        # Calculate text position
-        text_x = self.x + 4
-        text_y = self.y + (self.height - self.display.get_text_height()) // 2
+        # Clear background and draw border
+        self._draw_framed_rect(self.x, self.y, self.width, self.height,
+                               self.bg_color, border)
         
         # Draw text or placeholder
-        if self.text:
+        if self._len:
             display_text = self.text
             color = self.text_color
         else:
@@ -385,25 +644,42 @@ class TextInput(UIComponent):
             color = self.placeholder_color
         
         if display_text:
-            self.display.draw_text(display_text, text_x, text_y, color, self.bg_color)
-        
-        # Draw cursor if focused and text is not empty or no placeholder
-        if self.focused and (self.text or not self.placeholder):
-            current_time = time.ticks_ms()
-            if time.ticks_diff(current_time, self.cursor_blink_time) > 500:
-                self.cursor_visible = not self.cursor_visible
-                self.cursor_blink_time = current_time
-                self.dirty = True
-            
-            if self.cursor_visible:
-                cursor_x = text_x + self.display.get_text_width(self.text)
-                self.display.draw_line(cursor_x, text_y, 
-                                         cursor_x, text_y + self.display.get_text_height() - 1,
-                                         self.cursor_color)
+            self._draw_text(display_text, self.x + _TEXT_INSET, self._text_y, color, self.bg_color)
+
+    def _tail_rect(self, drawn):
+        """Cells between the drawn and current text length, plus the cursor column."""
+        char_w = DisplayManager.FONT.WIDTH
+        low = min(drawn, self._len)
+        # One column more than the characters, for the cursor at the end
+        span = abs(self._len - drawn) * char_w + 1
+        return (self.x + _TEXT_INSET + low * char_w, self._text_y, span, self._th)
+
+    def _draw_tail(self, drawn):
+        """Repaint only the characters that changed since drawn, and the cursor."""
+        length = self._len
+        rect = self._tail_rect(drawn)
+        
+        if length > drawn:
+            # The new glyph cells also cover the old cursor column
+            tail = bytes(self._buf[drawn:length]).decode()
+            self._draw_text(tail, rect[0], rect[1], self.text_color, self.bg_color)
+        else:
+            self._draw_rect(rect[0], rect[1], rect[2], rect[3],
+                            self.bg_color, filled=True)
         
-        self.dirty = False
+        if self._cursor_enabled():
+            self._draw_cursor(self.cursor_visible)
+        self.display.mark_dirty(rect[0], rect[1], rect[2], rect[3])
 
-class VirtualKeyboard:
+    def _draw_cursor(self, show):
+        """Draw the cursor line, or erase it with the background color."""
+        cursor_x = self._cursor_x()
+        text_y = self._text_y
+        self.display.draw_line(cursor_x, text_y, 
+                               cursor_x, text_y + self._th - 1,
+                               self.cursor_color if show else self.bg_color)
+
+class VirtualKeyboard(Drawable):
 
     """
     Virtual keyboard component for text input with full character set support.
@@ -451,6 +727,14 @@ class VirtualKeyboard:
         # Row 4: Space and Enter
         ['SPACE', 'ENTER']
     ]
+
+    # Flat row-major view of _LAYOUT, the form used at runtime.
+    # Key (row, col) is _LAYOUT_FLAT[_ROW_OFF[row] + col].
+    _LAYOUT_FLAT = tuple(key for row in _LAYOUT for key in row)
+    _ROW_LEN = tuple(len(row) for row in _LAYOUT)
+    _IDX_TO_RC = tuple((r, c) for r, row in enumerate(_LAYOUT) for c in range(len(row)))
+    # Running sum of _ROW_LEN: the flat index of each row's first key
+    _ROW_OFF = tuple(i for i, (r, c) in enumerate(_IDX_TO_RC) if c == 0)
     
     # Symbol mappings for shift state (caps lock affects symbols too)
     _SHIFT_MAP = {
@@ -459,7 +743,10 @@ class VirtualKeyboard:
         '-': '_', '=': '+', '[': '{', ']': '}', ';': ':',
         "'": '"', ',': '<', '.': '>', '/': '?'
     }
- 
+
+    # Short labels for the special keys
+    _LABELS = {'SPACE': 'SPC', 'ENTER': 'ENT', 'DEL': 'DEL', 'CAPS': 'CAP'}
+
     @classmethod
     def _calculate_layout_metrics(cls, display_width, display_height, font_width, font_height):
         """
@@ -509,14 +796,15 @@ class VirtualKeyboard:
     def __init__(self, display:DisplayManager, text_input:TextInput):
  
         self.display = display
+        self.x = 0
+        self.y = 0
         self.width = display.width
         self.height = display.height
         
-        # Calculate layout metrics once during initialization
-        self.metrics = self._calculate_layout_metrics(
-            self.width, self.height,
-            self.display.FONT.WIDTH, self.display.FONT.HEIGHT
-        )
+        # Layout is computed on first draw, see _layout
+        self.metrics = None
+        self._key_geom = None
+        self._key_height = 0
 
         # Keyboard state
         self.visible  = True
@@ -527,20 +815,60 @@ class VirtualKeyboard:
         self.selected_col = 0
         self.caps_lock = False
         self.target_text_input = text_input
+
+        # Static per-key characters, labels and kind, see _build_key_meta
+        self._key_meta = self._build_key_meta()
         
         # Color scheme - minimal and clean
-        self.bg_color = self.display.BLACK
-        self.key_color = self.display.WHITE
-        self.key_bg = self.display.BLACK
-        self.focused_key_bg = self.display.WHITE
-        self.focused_key_text = self.display.BLACK
-        self.special_key_color = self.display.CYAN
-        self.caps_active_color = self.display.YELLOW
-        
-        # Pre-calculate all key positions for performance
-        self._key_positions = self._calculate_key_positions()
+        self.bg_color = BLACK
+        self.key_color = WHITE
+        self.key_bg = BLACK
+        self.focused_key_bg = WHITE
+        self.focused_key_text = BLACK
+        self.special_key_color = CYAN
+        self.caps_active_color = YELLOW
+
+        # (background, text, border) per key style, resolved once
+        self._style_selected = (self.focused_key_bg, self.focused_key_text, self.focused_key_bg)
+        self._style_caps = (self.key_bg, self.caps_active_color, self.caps_active_color)
+        self._style_special = (self.key_bg, self.special_key_color, self.special_key_color)
+        self._style_normal = (self.key_bg, self.key_color, self.key_color)
+
+        # Bind drawing entry points once instead of on every key
+        self._draw_rect = display.draw_rect
+        self._draw_framed_rect = display.draw_framed_rect
+        self._draw_text = display.draw_text
+        self._mark_rect = display.mark_dirty
+        self._tw = display.get_text_width
+        self._th = display.get_text_height()
+
+        # State at the last draw, used to repaint only the keys that changed
+        self._prev_selected = None
+        self._prev_caps = False
+        self._clip = None  # (x, y, w, h) spoiled since the last draw, see invalidate
         
  
+    def _layout(self):
+        """Calculate layout metrics and key positions, once."""
+        if self._key_geom is not None:
+            return
+        self.metrics = self._calculate_layout_metrics(
+            self.width, self.height,
+            self.display.FONT.WIDTH, self.display.FONT.HEIGHT
+        )
+        self._key_height = self.metrics['key_height']
+
+        # Flatten to (x, y, width, text_x, text_y) per key in row-major order.
+        # Label lengths do not change with caps lock, so center them once.
+        text_dy = (self._key_height - self._th) // 2
+        geom = []
+        for row_positions, row in zip(self._calculate_key_positions(), self._LAYOUT):
+            for (x, y, w), key in zip(row_positions, row):
+                text_w = self._tw(self._LABELS.get(key, key))
+                geom.extend((x, y, w, x + (w - text_w) // 2, y + text_dy))
+        self._key_geom = array('h', geom)
+
+    @micropython.native
     def _calculate_key_positions(self):
         """
         Pre-calculate screen positions for all keys to optimize rendering.
@@ -550,10 +878,15 @@ class VirtualKeyboard:
         """
         positions = []
         metrics = self.metrics
-        print(metrics)
+        start_y = metrics['start_y']
+        row_height = metrics['row_height']
+        key_w = metrics['key_width']
+        key_pad = metrics['key_padding']
+        margin_x = metrics['margin_x']
+        wide_w = key_w * 6 // 5  # CAPS and DEL are 20% wider
         for row_idx, row in enumerate(self._LAYOUT):
             row_positions = []
-            current_y = metrics['start_y'] + (row_idx * metrics['row_height'])
+            current_y = start_y + (row_idx * row_height)
             
             # Handle special row layouts
             # if row_idx == 4:  # Space/Enter row - wider keys
@@ -565,53 +898,44 @@ class VirtualKeyboard:
             #                         current_y, enter_width))
             # else:
                 # Calculate row width and center it
-            row_width = len(row) * metrics['key_width'] + (len(row) - 1) * metrics['key_padding']
-            start_x = metrics['margin_x'] + (self.width - 2 * metrics['margin_x'] - row_width) // 2
+            row_width = len(row) * key_w + (len(row) - 1) * key_pad
+            start_x = margin_x + (self.width - 2 * margin_x - row_width) // 2
             
             for col_idx, key in enumerate(row):
-                key_x = start_x + col_idx * (metrics['key_width'] + metrics['key_padding'])
-                key_width = metrics['key_width']
+                key_x = start_x + col_idx * (key_w + key_pad)
+                key_width = key_w
                 
                 # Special key width adjustments
-                if key in ['CAPS', 'DEL']:
-                    key_width = int(metrics['key_width'] * 1.2)
+                if key == 'CAPS' or key == 'DEL':
+                    key_width = wide_w
                 
                 row_positions.append((key_x, current_y, key_width))
-            print(row_positions)
             positions.append(row_positions)
         
         return positions
     
-    def _get_key_char(self, row, col):
+    @classmethod
+    def _build_key_meta(cls):
         """
-        Get the character for a key at given position, accounting for caps lock.
+        Resolve every key's characters and labels for both caps states.
         
-        Args:
-            row (int): Row index
-            col (int): Column index
-            
         Returns:
-            str: Character to display/input
+            list: (lower, upper, lower_label, upper_label, kind) per key, row-major
         """
-        if row >= len(self._LAYOUT) or col >= len(self._LAYOUT[row]):
-            return ''
-        
-        key = self._LAYOUT[row][col]
-        
-        # Handle special keys
-        if key in ['CAPS', 'DEL', 'ENTER', 'SPACE']:
-            return key
-        
-        # Apply caps lock to letters
-        if key.isalpha():
-            return key.upper() if self.caps_lock else key
-        
-        # Apply shift to symbols if caps lock is on
-        if self.caps_lock and key in self._SHIFT_MAP:
-            return self._SHIFT_MAP[key]
-        
-        return key
-    
+        meta = []
+        for key in cls._LAYOUT_FLAT:
+            if key == 'CAPS':
+                upper, kind = key, _KEY_CAPS
+            elif key in ('DEL', 'ENTER', 'SPACE'):
+                upper, kind = key, _KEY_SPECIAL
+            elif key.isalpha():
+                upper, kind = key.upper(), _KEY_NORMAL
+            else:
+                upper, kind = cls._SHIFT_MAP.get(key, key), _KEY_NORMAL
+            meta.append((key, upper, cls._LABELS.get(key, key),
+                         cls._LABELS.get(upper, upper), kind))
+        return meta
+
     def _move_selection(self, direction):
         """
         Move keyboard selection in specified direction with boundary checking.
@@ -626,14 +950,14 @@ class VirtualKeyboard:
         if direction == 'up':
             self.selected_row = max(0, self.selected_row - 1)
             # Adjust column if new row has fewer keys
-            if self.selected_col >= len(self._LAYOUT[self.selected_row]):
-                self.selected_col = len(self._LAYOUT[self.selected_row]) - 1
+            if self.selected_col >= self._ROW_LEN[self.selected_row]:
+                self.selected_col = self._ROW_LEN[self.selected_row] - 1
                 
         elif direction == 'down':
-            self.selected_row = min(len(self._LAYOUT) - 1, self.selected_row + 1)
+            self.selected_row = min(len(self._ROW_LEN) - 1, self.selected_row + 1)
             # Adjust column if new row has fewer keys
-            if self.selected_col >= len(self._LAYOUT[self.selected_row]):
-                self.selected_col = len(self._LAYOUT[self.selected_row]) - 1
+            if self.selected_col >= self._ROW_LEN[self.selected_row]:
+                self.selected_col = self._ROW_LEN[self.selected_row] - 1
                 
         elif direction == 'left':
             if self.selected_col > 0:
@@ -642,20 +966,20 @@ class VirtualKeyboard:
                 # Wrap to end of previous row
                 if self.selected_row > 0:
                     self.selected_row -= 1
-                    self.selected_col = len(self._LAYOUT[self.selected_row]) - 1
+                    self.selected_col = self._ROW_LEN[self.selected_row] - 1
                     
         elif direction == 'right':
-            if self.selected_col < len(self._LAYOUT[self.selected_row]) - 1:
+            if self.selected_col < self._ROW_LEN[self.selected_row] - 1:
                 self.selected_col += 1
             else:
                 # Wrap to start of next row
-                if self.selected_row < len(self._LAYOUT) - 1:
+                if self.selected_row < len(self._ROW_LEN) - 1:
                     self.selected_row += 1
                     self.selected_col = 0
         
         # Mark for redraw if selection changed
         if (old_row, old_col) != (self.selected_row, self.selected_col):
-            self.dirty = True
+            self._mark_dirty()
     
     def _activate_key(self):
         """
@@ -665,19 +989,21 @@ class VirtualKeyboard:
         
         Handles special keys (CAPS, DEL, ENTER, SPACE) and regular character input.
         """
-        key = self._get_key_char(self.selected_row, self.selected_col)
+        lower, upper, _, _, kind = self._key_meta[
+            self._ROW_OFF[self.selected_row] + self.selected_col]
         
-        if key == 'CAPS':
+        # Ordinary keys, the common case, need only an int compare
+        if kind == _KEY_NORMAL:
+            self._update_target_text(upper if self.caps_lock else lower)
+        elif kind == _KEY_CAPS:
             self.caps_lock = not self.caps_lock
-            self.dirty = True
-        elif key == 'DEL':
+            self._mark_dirty()
+        elif lower == 'DEL':
             self._update_target_text('BACKSPACE')
-        elif key == 'ENTER':
+        elif lower == 'ENTER':
             self._update_target_text('ENTER')
-        elif key == 'SPACE':
+        else:  # SPACE
             self._update_target_text(' ')
-        elif key and key not in ['CAPS', 'DEL', 'ENTER', 'SPACE']:
-            self._update_target_text(key)
     
     def _update_target_text(self, char_or_action):
         """
@@ -708,16 +1034,82 @@ class VirtualKeyboard:
         if not self.visible or not self.dirty:
             return
         
-        # Clear background
-        self.display.clear(self.bg_color)
-        
-        # Draw all keys
-        for row_idx, row in enumerate(self._LAYOUT):
-            for col_idx, key in enumerate(row):
-                self._draw_key(row_idx, col_idx)
+        self._layout()
+        selected = (self.selected_row, self.selected_col)
+        prev = self._prev_selected
+        if self._keys_only():
+            if self._clip is not None:
+                self._draw_region(self._clip)
+            # Same labels: only the old and new selection keys changed
+            if prev != selected:
+                self._draw_key(prev[0], prev[1])
+            self._draw_key(self.selected_row, self.selected_col)
+        else:
+            # Clear background
+            self._draw_rect(self.x, self.y, self.width, self.height,
+                            self.bg_color, filled=True)
+            self.display.mark_dirty(self.x, self.y, self.width, self.height)
+            
+            # Draw all keys
+            draw_key = self._draw_key
+            row_len = self._ROW_LEN
+            for row in range(len(row_len)):
+                for col in range(row_len[row]):
+                    draw_key(row, col)
+        
+        self._prev_selected = selected
+        self._prev_caps = self.caps_lock
+        self._clip = None
+        self._mark_clean()
+
+    def _keys_only(self):
+        """True when the next draw repaints single keys rather than the whole keyboard."""
+        return (self._key_geom is not None and self._prev_selected is not None
+                and self._prev_caps == self.caps_lock)
+
+    def _key_rect(self, row, col):
+        """Screen area of one key, once the layout is known."""
+        base = (self._ROW_OFF[row] + col) * 5
+        geom = self._key_geom
+        return (geom[base], geom[base + 1], geom[base + 2], self._key_height)
+
+    def pending_rect(self):
+        """Area the next draw will repaint: the changed keys and clip, or everything."""
+        if not self._keys_only():
+            return (self.x, self.y, self.width, self.height)
+        prev = self._prev_selected
+        rect = _union(self._key_rect(prev[0], prev[1]),
+                      self._key_rect(self.selected_row, self.selected_col))
+        if self._clip is not None:
+            rect = _union(rect, self._clip)
+        return rect
+
+    def _draw_region(self, rect):
+        """Repaint the background and the keys that overlap rect."""
+        x, y, w, h = rect
+        x0 = max(x, self.x)
+        y0 = max(y, self.y)
+        x1 = min(x + w, self.x + self.width)
+        y1 = min(y + h, self.y + self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
         
-        self.dirty = False
+        self._draw_rect(x0, y0, x1 - x0, y1 - y0, self.bg_color, filled=True)
+        self._mark_rect(x0, y0, x1 - x0, y1 - y0)
+        
+        geom = self._key_geom
+        key_height = self._key_height
+        draw_key = self._draw_key
+        for index in range(len(self._IDX_TO_RC)):
+            base = index * 5
+            key_x = geom[base]
+            key_y = geom[base + 1]
+            if (key_x < x1 and x0 < key_x + geom[base + 2]
+                    and key_y < y1 and y0 < key_y + key_height):
+                row, col = self._IDX_TO_RC[index]
+                draw_key(row, col)
     
+    @micropython.native
     def _draw_key(self, row, col):
         """
         Draw individual key with appropriate styling.
@@ -726,90 +1118,62 @@ class VirtualKeyboard:
             row (int): Key row index
             col (int): Key column index
         """
-        if row >= len(self._key_positions) or col >= len(self._key_positions[row]):
+        if row >= len(self._ROW_LEN) or col >= self._ROW_LEN[row]:
             return
         
-        key_x, key_y, key_width = self._key_positions[row][col]
-        key_height = self.metrics['key_height']
-        key_char = self._get_key_char(row, col)
-        
-        # Determine key styling
-        is_selected = (row == self.selected_row and col == self.selected_col)
-        is_caps = (key_char == 'CAPS')
-        is_special = key_char in ['DEL', 'ENTER', 'SPACE']
+        index = self._ROW_OFF[row] + col
+        geom = self._key_geom
+        base = index * 5
+        key_x = geom[base]
+        key_y = geom[base + 1]
+        key_width = geom[base + 2]
+        key_height = self._key_height
+        _, _, lower_label, upper_label, kind = self._key_meta[index]
+        caps_lock = self.caps_lock
         
         # Key colors
-        if is_selected:
-            bg_color = self.focused_key_bg
-            text_color = self.focused_key_text
-            border_color = self.focused_key_bg
-        elif is_caps and self.caps_lock:
-            bg_color = self.key_bg
-            text_color = self.caps_active_color
-            border_color = self.caps_active_color
-        elif is_special:
-            bg_color = self.key_bg
-            text_color = self.special_key_color
-            border_color = self.special_key_color
+        if row == self.selected_row and col == self.selected_col:
+            bg_color, text_color, border_color = self._style_selected
+        elif kind == _KEY_CAPS and caps_lock:
+            bg_color, text_color, border_color = self._style_caps
+        elif kind == _KEY_SPECIAL:
+            bg_color, text_color, border_color = self._style_special
         else:
-            bg_color = self.key_bg
-            text_color = self.key_color
-            border_color = self.key_color
-        
-        # Draw key background
-        self.display.draw_rect(key_x, key_y, key_width, key_height, 
-                                  bg_color, filled=True)
+            bg_color, text_color, border_color = self._style_normal
         
-        # Draw key border
-        self.display.draw_rect(key_x, key_y, key_width, key_height, border_color)
+        # Draw key background and border
+        self._draw_framed_rect(key_x, key_y, key_width, key_height,
+                               bg_color, border_color)
         
-        # Draw key text - handle special key labels
-        display_text = self._get_display_text(key_char)
-        text_width = self.display.get_text_width(display_text)
-        text_height = self.display.get_text_height()
+        # Draw key text - special keys use their short labels
+        display_text = upper_label if caps_lock else lower_label
+        text_x = geom[base + 3]
+        text_y = geom[base + 4]
         
-        text_x = key_x + (key_width - text_width) // 2
-        text_y = key_y + (key_height - text_height) // 2
-        
-        self.display.draw_text(display_text, text_x, text_y, text_color, bg_color)
-    
-    def _get_display_text(self, key_char):
-        """
-        Get display text for key labels.
-        
-        Args:
-            key_char (str): Key character
-            
-        Returns:
-            str: Text to display on key
-        """
-        if key_char == 'SPACE':
-            return 'SPC'
-        elif key_char == 'ENTER':
-            return 'ENT'
-        elif key_char == 'DEL':
-            return 'DEL'
-        elif key_char == 'CAPS':
-            return 'CAP'
-        else:
-            return key_char
+        self._draw_text(display_text, text_x, text_y, text_color, bg_color)
+        self._mark_rect(key_x, key_y, key_width, key_height)
     
     def handle_encoder_rotation(self, direction, steps):
         """
         Handle encoder rotation for keyboard navigation.
         
-        Call Stack: Screen input handler → handle_encoder_rotation → _move_selection
+        Call Stack: Screen input handler → handle_encoder_rotation
         
         Args:
             direction (str): Rotation direction ('clockwise' or 'counterclockwise')
             steps (int): Number of steps rotated
         """
-        # Map rotation to movement - treat each step as one movement
-        for _ in range(steps):
-            if direction == 'clockwise':
-                self._move_selection('right')
-            else:
-                self._move_selection('left')
+        # Each step moves one key along the row-major order, the same as
+        # repeated left/right moves, stopping at the first and last key
+        index = self._ROW_OFF[self.selected_row] + self.selected_col
+        if direction == 'clockwise':
+            new_index = min(index + steps, len(self._LAYOUT_FLAT) - 1)
+        else:
+            new_index = max(index - steps, 0)
+        
+        if new_index != index:
+            self.selected_row, self.selected_col = self._IDX_TO_RC[new_index]
+            self._mark_dirty()
     
     def handle_button_press(self, button_name, press_type):
         """
@@ -836,9 +1200,18 @@ class VirtualKeyboard:
         """
         self.target_text_input = text_input
 
-    def set_focus(self, focused):
-        """Set component focus state."""
-        if self.focused != focused:
-            self.focused = focused
-            self.dirty = True
-            self.visible = True
\ No newline at end of file
+    def invalidate(self, rect=None):
+        """
+        Force a repaint on the next draw.
+
+        Args:
+            rect (tuple): Spoiled (x, y, width, height) area, None for all
+        """
+        if rect is None:
+            self._prev_selected = None
+            self._clip = None
+        elif self._prev_selected is not None:
+            # Only the keys under the spoiled area need repainting
+            clip = self._clip
+            self._clip = rect if clip is None else _union(clip, rect)
+        self._mark_dirty()
@@ -0,0 +1,23 @@
+"""
+Row expansion for rendering 1 bit font rows as RGB565 pixels.
+
+A glyph row of an 8 pixel wide font is one byte, so there are only 256
+possible rows per color pair. Each is expanded the first time a glyph uses
+it and kept, so rendering a row is then a table lookup and a 16 byte copy
+instead of testing each bit.
+"""
+
+
+def expand_row(bits, fg_bytes, bg_bytes):
+    """
+    Expand one 8 pixel row pattern for one color pair.
+
+    Args:
+        bits (int): Glyph row byte, most significant bit leftmost
+        fg_bytes (bytes): Packed foreground pixel (2 bytes)
+        bg_bytes (bytes): Packed background pixel (2 bytes)
+
+    Returns:
+        bytes: 16 bytes of RGB565 pixels
+    """
+    return b"".join(fg_bytes if (bits >> (7 - i)) & 1 else bg_bytes for i in range(8))
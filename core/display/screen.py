@@ -1,20 +1,32 @@
-from lib.configs.tft_buttons import ButtonManager, RotaryEncoder, AdvancedButtonManager
-from core.display.base import DisplayManager
+from lib.configs.tft_buttons import AdvancedButtonManager
+from core.display.base import DisplayManager, BLACK, WHITE
 
 
 class Screen:
 
-    _components:list = [] 
-
-    button = ButtonManager()
-    encoder = RotaryEncoder()
-    button_manager = AdvancedButtonManager(button_manager=button, encoder_manager=encoder)
+    # Uses the shared input managers, so pin interrupts are set up only once
+    button_manager = AdvancedButtonManager()
+    button = button_manager.button_manager
+    encoder = button_manager.encoder
     
     rotation = 3
     title = ""
+    _title_x = 0  # title placement, measured once in set_title
+    _title_w = 0
     display = DisplayManager(rotation=rotation)
+
+    # Fixed for the life of the display, so read once
+    _screen_w = display.width
+    _screen_h = display.height
+    _text_h = display.get_text_height()
     focus_counter = 1
     def __init__(self):
+        self._components = []
+        self._dirty_rects = []
+        self._dirty_count = 0  # components currently flagged dirty
+        self._dirty_flags = bytearray()  # dirty flag per entry of _components
+        self._uid_index = {}  # uid -> component, for focus cycling
+        self._max_uid = 0
         self.focused_component = None
         self.setup_input_handlers()
 
@@ -29,54 +41,158 @@ class Screen:
             cls.focus_counter = 0
         cls.focus_counter += 1
 
-    @classmethod
-    def get_focused_component(cls) -> any | None:
-        """Checks UI component attached to the screen."""
-        for component in cls._components:
-            if component.focused:
-                return component
-        return None
+    def get_focused_component(self) -> any | None:
+        """Return the component that currently has focus."""
+        return self.focused_component
  
-    @classmethod
-    def draw(cls, clear=False):
+    def draw(self, clear=False):
         """Draw the screen and all components."""
+        cls = self.__class__
+        display = cls.display
+        components = self._components
+        dirty_rects = self._dirty_rects
 
-        if clear:
-            cls.display.clear()
+        # Past half the screen one full repaint is cheaper than patching regions.
+        # Components report only the area they will actually repaint.
+        dirty_area = 0
+        for _, _, w, h in dirty_rects:
+            dirty_area += w * h
+        flags = self._dirty_flags
+        for i in range(len(components)):
+            if flags[i]:
+                _, _, w, h = components[i].pending_rect()
+                dirty_area += w * h
+        full = clear or dirty_area > (cls._screen_w * cls._screen_h) // 2
+
+        if full:
+            display.clear()
 
         # Draw title if present
-        if cls.title:
-            title_x = (cls.display.width - cls.display.get_text_width(cls.title)) // 2
-            cls.display.draw_text(cls.title, title_x, 5, 
-                                     cls.display.WHITE, cls.display.BLACK)
-        # Draw all components
-        for component in cls._components:
-            if component.dirty or component.focused:
+        title = self.title
+        if title:
+            title_w = self._title_w
+            title_h = cls._text_h
+            title_x = self._title_x
+            if full or cls._intersects((title_x, 5, title_w, title_h), dirty_rects):
+                display.draw_text(title, title_x, 5, WHITE, BLACK)
+                display.mark_dirty(title_x, 5, title_w, title_h)
+
+        # Components paint opaquely in list order, so a repaint only spoils
+        # the components stacked above it
+        painted = []
+        for i in range(len(components)):
+            component = components[i]
+            rect = cls._component_rect(component)
+            if full:
+                component.invalidate()
+            else:
+                spoiled = cls._overlap(rect, dirty_rects, painted)
+                if spoiled is not None:
+                    component.invalidate(spoiled)
+            if flags[i]:
+                painted.append(component.pending_rect())
                 component.draw()
 
-    @classmethod
-    def update(cls):
+        dirty_rects.clear()
+
+        # Push everything drawn this frame to the panel at once
+        display.flush()
+
+    @staticmethod
+    def _component_rect(component):
+        """Bounding box of a component as (x, y, width, height)."""
+        return (component.x, component.y, component.width, component.height)
+
+    @staticmethod
+    def _intersects(rect, rects):
+        """Check if rect overlaps any rectangle in rects."""
+        x, y, w, h = rect
+        for rx, ry, rw, rh in rects:
+            if x < rx + rw and rx < x + w and y < ry + rh and ry < y + h:
+                return True
+        return False
+
+    @staticmethod
+    def _overlap(rect, *rect_lists):
+        """Bounding box of the parts of rect covered by the given rects, or None."""
+        x, y, w, h = rect
+        x1 = x + w
+        y1 = y + h
+        bx0 = by0 = bx1 = by1 = None
+        for rects in rect_lists:
+            for rx, ry, rw, rh in rects:
+                ox0 = max(x, rx)
+                oy0 = max(y, ry)
+                ox1 = min(x1, rx + rw)
+                oy1 = min(y1, ry + rh)
+                if ox0 < ox1 and oy0 < oy1:
+                    if bx0 is None:
+                        bx0, by0, bx1, by1 = ox0, oy0, ox1, oy1
+                    else:
+                        bx0 = min(bx0, ox0)
+                        by0 = min(by0, oy0)
+                        bx1 = max(bx1, ox1)
+                        by1 = max(by1, oy1)
+        if bx0 is None:
+            return None
+        return (bx0, by0, bx1 - bx0, by1 - by0)
+
+    def update(self):
         """Update screen and handle input."""
-        cls.button_manager.update()
+        self.button_manager.update()
+
+        # Time-driven updates (e.g. cursor blink) paint only what they touch
+        for component in self._components:
+            component.tick()
         
-        # Check if any components need redrawing
-        needs_redraw = any(component.dirty for component in cls._components)
-        if needs_redraw:
-            cls.draw()
+        # Components keep the count current, so no scan is needed
+        if self._dirty_count or self._dirty_rects:
+            self.draw()
+        else:
+            self.display.flush()
 
-    @classmethod
-    def set_title(cls, text): 
-        cls.title = text
+    def set_title(self, text):
+        text_h = self._text_h
+        if self.title:
+            # Blank the old title so a shorter one leaves no tail behind;
+            # components under it repaint through the dirty rect
+            old = (self._title_x, 5, self._title_w, text_h)
+            self.display.draw_rect(old[0], 5, old[2], text_h, BLACK, filled=True)
+            self.display.mark_dirty(old[0], 5, old[2], text_h)
+            self._dirty_rects.append(old)
+        self.title = text
+        self._title_w = self.display.get_text_width(text)
+        self._title_x = (self._screen_w - self._title_w) >> 1
+        if text:
+            self._dirty_rects.append((self._title_x, 5, self._title_w, text_h))
+
+    def _attach(self, component):
+        """Let the component report its dirty state to this screen."""
+        component._screen = self
+        component._idx = len(self._dirty_flags)
+        self._dirty_flags.append(1 if component.dirty else 0)
+        if component.dirty:
+            self._dirty_count += 1
+        uid = getattr(component, 'uid', None)
+        if uid is not None:
+            self._uid_index[uid] = component
+            if uid > self._max_uid:
+                self._max_uid = uid
 
     def add_component(self, component):
         """Add a UI component to the screen."""
         if isinstance(component, list): 
             self._components.extend(component)
-            if self.focused_component is None: 
+            for comp in component:
+                self._attach(comp)
+                self._dirty_rects.append(self._component_rect(comp))
+            if self.focused_component is None and component:
                 self.set_focus(component[0])
-                return
-            
+            return
+
         self._components.append(component)
+        self._attach(component)
+        self._dirty_rects.append(self._component_rect(component))
         if self.focused_component is None:
             self.set_focus(component)
 
@@ -133,13 +249,9 @@ class Screen:
     def handle_user_button(self):
         """Handle user button press. Override in subclasses."""
         try:
-            focused_component = self.get_focused_component()
-            threshold = max([comp.uid for comp in self._components])
-            self.focus_cycle(max=threshold)
-            next_component = [comp for comp in self._components if comp.uid == self.focus_counter]
-            next_comp = next_component.pop()
-            if next_comp != focused_component:
-                focused_component.set_focus(False)
+            self.focus_cycle(max=self._max_uid)
+            next_comp = self._uid_index.get(self.focus_counter)
+            if next_comp is not None and next_comp is not self.focused_component:
                 self.set_focus(next_comp)
                 
         except Exception as e:
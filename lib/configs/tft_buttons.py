@@ -16,8 +16,37 @@ Version: 1.0
 """
 
 from machine import Pin, SPI
+from micropython import const, schedule
+import micropython
+from array import array
 import time
 
+try:
+    from machine import Encoder  # ESP32 PCNT quadrature decoder, newer firmware
+except ImportError:
+    Encoder = None
+
+DEBUG = const(0)  # Set to 1 to log input events to the console
+
+# Buttons act on the first edge, then ignore edges until they have been
+# quiet this long (a relaxing timer: every bounce restarts the window)
+_RELAX_MS = const(50)
+
+# Slots in AdvancedButtonManager.encoder_callbacks
+_DIR_CW = const(0)
+_DIR_CCW = const(1)
+
+# Button ids and press types; a button callback lives at id * 2 + press type
+_BTN_ENCODER = const(0)
+_BTN_USER = const(1)
+_BTN_POWER = const(2)
+_PT_SHORT = const(0)
+_PT_LONG = const(1)
+
+
+# Lets an exception raised inside a hard interrupt handler still be reported
+micropython.alloc_emergency_exception_buf(100)
+
 # =============================================================================
 # HARDWARE PIN DEFINITIONS
 # =============================================================================
@@ -45,10 +74,42 @@ encoder_button = Pin(ENCODER_BUTTON_PIN, Pin.IN, Pin.PULL_UP)  # Encoder button
 user_button = Pin(USER_BUTTON_PIN, Pin.IN, Pin.PULL_UP)  # User button input
 pwr_button = Pin(PWR_EN_PIN, Pin.IN, Pin.PULL_UP)  # Power button input
 
+# Optional flag set by every input interrupt, see set_wakeup()
+_wakeup = None
+
+
+def _wake(pin):
+    """Interrupt handler that only wakes the event loop."""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def set_wakeup(flag):
+    """
+    Register a flag that input interrupts set when something happens.
+
+    Lets an event loop sleep until input arrives instead of polling, e.g.
+    with an asyncio.ThreadSafeFlag (whose set() is safe to call from an ISR).
+
+    Args:
+        flag: Object with a set() method, or None to disable
+    """
+    global _wakeup
+    _wakeup = flag
+
 # =============================================================================
 # ROTARY ENCODER CLASS
 # =============================================================================
 
+_PCNT_ID = const(0)              # PCNT unit used for the encoder
+_PCNT_FILTER_NS = const(10000)   # Glitch filter, close to the PCNT maximum
+
+# Quadrature transition table indexed by (previous << 2) | current, where a
+# state is (A << 1) | B. Entries are the step plus one: a change of A while B
+# holds counts one step (clockwise when A and B now differ), a change of B only
+# tracks the state, and an invalid jump (both changed) counts nothing.
+_QTAB = b"\x01\x01\x02\x01\x01\x01\x01\x00\x00\x01\x01\x01\x01\x02\x01\x01"
+
 
 class RotaryEncoder:
     """
@@ -62,10 +123,9 @@ class RotaryEncoder:
         pin_a (Pin): Phase A output pin of the encoder
         pin_b (Pin): Phase B output pin of the encoder
         pin_button (Pin): Encoder's integrated push button pin
-        last_a_state (int): Previous state of phase A for change detection
         counter (int): Accumulated rotation steps (positive = clockwise)
         button_pressed (bool): Flag indicating if button was pressed
-        last_interrupt_time (int): Timestamp for debouncing calculations
+        _last_btn_ms (int): Time of the last accepted button press, for debouncing
     """
 
     def __init__(self):
@@ -82,77 +142,79 @@ class RotaryEncoder:
         self.pin_button = pin_button = encoder_button
 
         # Initialize state tracking variables
-        self.last_a_state = pin_a.value()  # Store initial state of phase A
-        self.last_b_state = pin_b.value()  # Store initial state of phase B
+        self._state = (pin_a.value() << 1) | pin_b.value()  # Last (A << 1) | B
         self.last_button_state = pin_button.value()  # Store initial button state
         self.counter = 0  # Tracks net rotation steps
         self.button_pressed = False  # Flag for button press detection
-        self.last_interrupt_time = 0  # Timestamp for debouncing
-
-        # Set up interrupt handlers for responsive input
-        self.pin_a.irq(
-            trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=self.encoder_handler
-        )
+        self._last_btn_ms = time.ticks_add(time.ticks_ms(), -_RELAX_MS - 1)  # Button debounce timestamp, not shared with rotation
+
+        if Encoder is not None:
+            # The PCNT peripheral counts the edges in hardware, two counts
+            # per cycle like the software decoder; phase A only wakes the loop
+            self._pcnt = Encoder(_PCNT_ID, pin_a, pin_b, phases=2,
+                                 filter_ns=_PCNT_FILTER_NS)
+            self._pcnt_last = 0
+            self.pin_a.irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=_wake,
+                           hard=True)
+        else:
+            # Set up interrupt handlers for responsive input; both phases are
+            # watched so the decoder always knows the current state
+            self._pcnt = None
+            self.pin_a.irq(
+                trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=self.encoder_handler,
+                hard=True
+            )
+            self.pin_b.irq(
+                trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=self.encoder_handler,
+                hard=True
+            )
         
-        self.pin_button.irq(trigger=Pin.IRQ_FALLING, handler=self.button_handler)
+        # Both edges, so release bounce also restarts the debounce window
+        self.pin_button.irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING,
+                            handler=self.button_handler, hard=True)
 
+    @micropython.native
     def encoder_handler(self, pin):
         """
-        Interrupt handler for encoder rotation detection.
+        Interrupt handler for encoder rotation detection, used when the
+        firmware has no machine.Encoder.
 
-        Uses quadrature encoding logic to determine rotation direction.
-        Triggers on both pin A and B changes for better resolution.
+        Decodes the quadrature signal with the _QTAB transition table, so
+        contact bounce on one phase cancels itself out without a time-based
+        debounce.
 
         Args:
             pin (Pin): The pin that triggered the interrupt
         """
-        current_time = time.ticks_ms()
-
-        # Debounce - prevent false triggers from electrical noise
-        if time.ticks_diff(current_time, self.last_interrupt_time) < 2:
-            return
-
-        self.last_interrupt_time = current_time
-
-        # Quadrature encoding logic:
-        # When A changes from 0->1 (rising edge):
-        #   - If B=0, rotation is clockwise
-        #   - If B=1, rotation is counter-clockwise
-        # When A changes from 1->0 (falling edge):
-        #   - If B=1, rotation is clockwise
-        #   - If B=0, rotation is counter-clockwise
-
-        # Only handle pin A interrupts for simplicity
-        if pin == self.pin_a:
-            # Read current states
-            a_state = self.pin_a.value()
-            b_state = self.pin_b.value()
-
-            # Simple quadrature logic: when A changes, check B state
-            if a_state != self.last_a_state:
-                if (a_state == 1 and b_state == 0) or (a_state == 0 and b_state == 1):
-                    self.counter += 1  # Clockwise
-                else:
-                    self.counter -= 1  # Counter-clockwise
-
-                self.last_a_state = a_state
+        curr = (self.pin_a.value() << 1) | self.pin_b.value()
+        delta = _QTAB[(self._state << 2) | curr] - 1
+        self._state = curr
 
+        if delta:
+            self.counter += delta
+            if _wakeup is not None:
+                _wakeup.set()
 
+    @micropython.native
     def button_handler(self, pin):
         """
         Interrupt handler for encoder button press detection.
 
-        Called when the encoder button is pressed. Includes debouncing
-        to prevent multiple triggers from a single press.
+        Called on every edge of the encoder button. A press is a falling
+        edge (pin low) after _RELAX_MS without edges; every edge, press or
+        release, restarts that window, so neither bounce registers a press.
 
         Args:
             pin (Pin): The pin that triggered the interrupt
         """
         current_time = time.ticks_ms()
-        # 200ms debounce time to prevent multiple detections
-        if time.ticks_diff(current_time, self.last_interrupt_time) > 200:
+        last_time = self._last_btn_ms
+        self._last_btn_ms = current_time  # Every edge restarts the window
+        if pin.value() == 0 and time.ticks_diff(current_time, last_time) > _RELAX_MS:
             self.button_pressed = True  # Set button pressed flag
-            self.last_interrupt_time = current_time  # Update debounce timer
+
+            if _wakeup is not None:
+                _wakeup.set()
 
     def get_rotation(self):
         """
@@ -163,6 +225,13 @@ class RotaryEncoder:
             int: Number of steps rotated (positive = clockwise, negative = counter-clockwise)
                  0 if no rotation occurred
         """
+        pcnt = self._pcnt
+        if pcnt is not None:
+            count = pcnt.value()
+            value = count - self._pcnt_last
+            self._pcnt_last = count
+            return value
+
         value = self.counter  # Store current counter value
         self.counter = 0  # Reset counter for next reading
         return value
@@ -184,6 +253,14 @@ class RotaryEncoder:
 # BUTTON MANAGER CLASS
 # =============================================================================
 
+# Completed press ring buffer
+_EVENTS = const(8)         # Capacity, a power of two
+_EVENT_MASK = const(7)     # _EVENTS - 1
+
+# Raw edge ring buffer, filled by the interrupt handlers
+_EDGES = const(8)          # Capacity, a power of two
+_EDGE_MASK = const(7)      # _EDGES - 1
+
 
 class ButtonManager:
     """
@@ -193,62 +270,147 @@ class ButtonManager:
     and long presses, and provides a simple interface to check button states.
 
     Attributes:
-        buttons (dict): Mapping of button names to Pin objects
-        button_states (dict): Current pressed state for each button
-        button_press_times (dict): Timestamp when each button was pressed
+        buttons (tuple): Button pins, in the order of their names in _NAMES
         long_press_duration (int): Duration threshold for long press in milliseconds
     """
 
+    # Button names by id and press type names, for logging and lookups
+    _NAMES = ("encoder", "user", "power")
+    _TYPES = ("short_press", "long_press")
+
     def __init__(self):
         """Initialize the button manager with all available buttons."""
-        # Dictionary mapping button names to their hardware pins
-        self.buttons = {
-            "encoder": encoder_button,  # Rotary encoder integrated button
-            "user": user_button,  # General purpose user button
-            "power": pwr_button,  # Power control button
-        }
+        # Hardware pins by button index
+        self.buttons = (
+            encoder_button,  # Rotary encoder integrated button
+            user_button,  # General purpose user button
+            pwr_button,  # Power control button
+        )
 
         self.long_press_time = 2000 # ms
-        self.press_events = []  # Stores raw press events for processing
         self.time_counter = 0 # time based counter
+
+        # Last edge per button, for the _RELAX_MS debounce
+        quiet = time.ticks_add(time.ticks_ms(), -_RELAX_MS - 1)
+        self._last_edge = array('i', [quiet] * len(self.buttons))
+
+        # Press start per button, matched directly on release
+        self._pressed = bytearray(len(self.buttons))
+        self._press_start = array('i', [0] * len(self.buttons))
+
+        # Completed presses in a preallocated ring, so recording one
+        # allocates nothing. Per slot: press type, button id and duration
+        # in ms.
+        self._evt_type = bytearray(_EVENTS)
+        self._evt_btn = bytearray(_EVENTS)
+        self._evt_ms = array('i', [0] * _EVENTS)
+        self._head = 0  # Next slot to write
+        self._tail = 0  # Next slot get_events reads
+
+        # Edges recorded by the hard interrupt handlers, as the pin level
+        # code (see _button_handler) and ticks_ms, until _drain handles them
+        self._edge_code = bytearray(_EDGES)
+        self._edge_ms = array('i', [0] * _EDGES)
+        self._edge_head = 0
+        self._edge_tail = 0
+        self._drain_pending = False
+
+        # Bound once, so scheduling from an interrupt allocates nothing
+        self._drain_ref = self._drain
                 
-        # Setup hardware interrupts for all buttons
-        for name, button in self.buttons.items():
+        # Setup hardware interrupts for all buttons, one bound handler each
+        # so no closure is involved when an interrupt fires
+        handlers = (self._irq_encoder, self._irq_user, self._irq_power)
+        for button, handler in zip(self.buttons, handlers):
             # Configure interrupt to trigger on both press and release
             # Pin.IRQ_FALLING: Trigger when button is pressed (HIGH → LOW)
             # Pin.IRQ_RISING: Trigger when button is released (LOW → HIGH)
             button.irq(
                 trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING, 
-                handler=lambda p, n=name: self._button_handler(p, n)
+                handler=handler,
+                hard=True
             )
+
+    # The hard interrupt handlers only record the edge and leave the
+    # bookkeeping to _drain, scheduled once per burst of edges
+    @micropython.native
+    def _irq_encoder(self, pin):
+        self._edge(_BTN_ENCODER << 1 | pin.value())
+
+    @micropython.native
+    def _irq_user(self, pin):
+        self._edge(_BTN_USER << 1 | pin.value())
+
+    @micropython.native
+    def _irq_power(self, pin):
+        self._edge(_BTN_POWER << 1 | pin.value())
+
+    @micropython.native
+    def _edge(self, code):
+        i = self._edge_head
+        head = (i + 1) & _EDGE_MASK
+        if head == self._edge_tail:
+            return  # Ring full until the pending drain runs, drop this edge
+        self._edge_code[i] = code
+        self._edge_ms[i] = time.ticks_ms()
+        self._edge_head = head
+        if not self._drain_pending:
+            self._drain_pending = True
+            try:
+                schedule(self._drain_ref, 0)
+            except Exception:
+                self._drain_pending = False  # Schedule queue full, retry on the next edge
+
+    def _drain(self, _):
+        """Handle the recorded edges, run by micropython.schedule."""
+        self._drain_pending = False
+        i = self._edge_tail
+        while i != self._edge_head:
+            self._button_handler(self._edge_code[i], self._edge_ms[i])
+            i = (i + 1) & _EDGE_MASK
+        self._edge_tail = i
             
-    def _button_handler(self, pin, name):
+    @micropython.native
+    def _button_handler(self, code, now):
         """
-        Interrupt Service Routine (ISR) - Called automatically on button state changes.
-        This function must be fast and non-blocking.
+        Record a button state change, outside interrupt context.
         
         Args:
-            pin: The pin object that triggered the interrupt
-            name: The name of the button from the buttons dictionary
+            code (int): (button index << 1) | pin level at the interrupt
+            now (int): ticks_ms at the interrupt
         """
-        current_state = pin.value()
-        start_time_ms = time.ticks_ms()
-        if current_state == 0:  # Falling edge - button pressed
+        button = code >> 1
+        last_edge = self._last_edge[button]
+        self._last_edge[button] = now
+        if time.ticks_diff(now, last_edge) <= _RELAX_MS:
+            return  # Contact bounce
+
+        if code & 1 == 0:  # Falling edge - button pressed
             # Record press start time with millisecond precision
-            if len(self.press_events) >= 5: # check list length
-                self.press_events = self.press_events[1:5]
-            self.press_events.insert(0, ('press_start', name, start_time_ms))
-
-        else:  # Rising edge - button released
-            # Find the matching press_start event for this button
-            # Calculate press duration  
-            for i, (event_type, btn_name, timestamp) in enumerate(self.press_events):
-                if event_type == 'press_start' and btn_name == name:
-                    end_time_ms = time.ticks_ms()
-                    duration = time.ticks_diff(end_time_ms, timestamp)
-                    # Record press end with duration
-                    self.press_events.insert(0, ('press_end', name, duration))
-                    break  # Only process the most recent press start
+            self._press_start[button] = now
+            self._pressed[button] = 1
+
+        elif self._pressed[button]:  # Rising edge - button released
+            # Classify the press now, so get_events only has to report it
+            self._pressed[button] = 0
+            duration = time.ticks_diff(now, self._press_start[button])
+            self._push(_PT_LONG if duration >= self.long_press_time else _PT_SHORT,
+                       button, duration)
+
+        if _wakeup is not None:
+            _wakeup.set()
+
+    @micropython.native
+    def _push(self, event_type, button, ms):
+        """Append an event to the ring, dropping the oldest unread when full."""
+        i = self._head
+        self._evt_type[i] = event_type
+        self._evt_btn[i] = button
+        self._evt_ms[i] = ms
+        i = (i + 1) & _EVENT_MASK
+        self._head = i
+        if i == self._tail:
+            self._tail = (i + 1) & _EVENT_MASK
         
     def get_events(self):
         """
@@ -257,26 +419,28 @@ class ButtonManager:
         
         Returns:
             list: List of tuples containing completed button events
-            Format: [(event_type, button_name, duration_ms), ...]
-            Event types: 'short_press' or 'long_press'
+            Format: [(press_type, button_id, duration_ms), ...]
+            press_type is _PT_SHORT or _PT_LONG and button_id indexes _NAMES
         """
         events = []  # Completed events to return
-        new_events = []  # Ongoing events to keep for next call
         
-        # Process all accumulated events
-        for event in self.press_events:
-            if event[0] == 'press_end':
-                # This is a completed press event
-                event_type = 'long_press' if event[2] >= self.long_press_time else 'short_press'
-                events.append((event_type, event[1], event[2]))
-            else:
-                # This is an ongoing press, keep it for future processing
-                new_events.append(event)
+        # Report the presses completed since the last call
+        i = self._tail
+        head = self._head
+        while i != head:
+            events.append((self._evt_type[i], self._evt_btn[i], self._evt_ms[i]))
+            i = (i + 1) & _EVENT_MASK
         
-        # Update the events list, keeping only ongoing presses
-        self.press_events = new_events
+        self._tail = head
         return events
 
+
+# Shared instances, created once so every pin gets its interrupt handler
+# exactly once however many managers use them. The encoder is created last
+# and so keeps the encoder button pin, as it always has.
+_BUTTONS = ButtonManager()
+_ENCODER = RotaryEncoder()
+
  
 # =============================================================================
 # ADVANCED BUTTON MANAGER CLASS
@@ -290,32 +454,38 @@ class AdvancedButtonManager:
     This class simplifies input handling by providing a clean interface to register callback functions for different types of events from buttons and rotary encoders. It coordinates between lower-level ButtonManager and RotaryEncoder instances to provide a unified event system.
 
     Attributes:
-        button_callbacks (dict): A nested dictionary storing callback functions for button events. Organized by button type ('encoder', 'user', 'power') and press duration('short', 'long').
+        button_callbacks (list): Callback functions for button events, at button id * 2 + press type (see _BTN_* and _PT_*), so a dispatch is a single index.
 
-        encoder_callbacks (dict): Dictionary storing callback functions for encoder rotation events ('clockwise' and 'counterclockwise').
+        encoder_callbacks (list): Callback functions for encoder rotation events, [clockwise, counterclockwise].
 
         button (ButtonManager): The underlying button manager instance for handling button inputs. 
         
         encoder (RotaryEncoder): The underlying rotary encoder instance for handling rotation inputs.
     """
 
-    def __init__(self, encoder_manager: RotaryEncoder, button_manager: ButtonManager):
-        """Initialize the advanced button manager with callback structures."""
+    def __init__(self, encoder_manager: RotaryEncoder = None, button_manager: ButtonManager = None):
+        """
+        Initialize the advanced button manager with callback structures.
 
-        self.button_callbacks = {
-            "encoder": {"short": None, "long": None},  # Encoder button callbacks
-            "user": {"short": None, "long": None},  # User button callbacks
-            "power": {"short": None, "long": None},  # Power button callbacks
-        }
+        Args:
+            encoder_manager (RotaryEncoder): Encoder to read, defaults to the shared one
+            button_manager (ButtonManager): Buttons to read, defaults to the shared one
+        """
 
-        self.encoder_callbacks = {
-            "clockwise": None,  # Clockwise rotation callback
-            "counterclockwise": None,  # Counter-clockwise rotation callback
-        }
+        self.button_callbacks = [
+            None, None,  # Encoder button callbacks (short, long)
+            None, None,  # User button callbacks (short, long)
+            None, None,  # Power button callbacks (short, long)
+        ]
+
+        self.encoder_callbacks = [
+            None,  # Clockwise rotation callback
+            None,  # Counter-clockwise rotation callback
+        ]
 
         # Initialize the lower-level managers
-        self.button_manager = button_manager
-        self.encoder = encoder_manager
+        self.button_manager = button_manager if button_manager is not None else _BUTTONS
+        self.encoder = encoder_manager if encoder_manager is not None else _ENCODER
         
 
     def set_button_callback(self, button_name, press_type, callback):
@@ -330,12 +500,14 @@ class AdvancedButtonManager:
         Raises:
             ValueError: If button_name or press_type is invalid
         """
-        if button_name not in self.button_callbacks:
+        if button_name not in ButtonManager._NAMES:
             raise ValueError(f"Invalid button name: {button_name}")
         if press_type not in ["short", "long"]:
             raise ValueError(f"Invalid press type: {press_type}")
 
-        self.button_callbacks[button_name][press_type] = callback
+        button_id = ButtonManager._NAMES.index(button_name)
+        press = _PT_LONG if press_type == "long" else _PT_SHORT
+        self.button_callbacks[button_id * 2 + press] = callback
 
     def set_encoder_callback(self, direction, callback):
         """
@@ -351,7 +523,7 @@ class AdvancedButtonManager:
         if direction not in ["clockwise", "counterclockwise"]:
             raise ValueError(f"Invalid direction: {direction}")
 
-        self.encoder_callbacks[direction] = callback
+        self.encoder_callbacks[_DIR_CW if direction == "clockwise" else _DIR_CCW] = callback
     
     def update(self):
         """
@@ -360,34 +532,34 @@ class AdvancedButtonManager:
         This method should be called regularly in the main application loop
         to process input events and execute registered callbacks.
         """
+        encoder = self.encoder
+        encoder_callbacks = self.encoder_callbacks
+        button_callbacks = self.button_callbacks
+
         # Handle encoder rotation
-        rotation = self.encoder.get_rotation()
-        if rotation > 0 and self.encoder_callbacks["clockwise"]:
-            self.encoder_callbacks["clockwise"](rotation)  # Call clockwise callback
-        elif rotation < 0 and self.encoder_callbacks["counterclockwise"]:
-            self.encoder_callbacks["counterclockwise"](
-                abs(rotation)
-            )  # Call counter-clockwise callback
-
-        # Handle encoder button
-        if self.encoder.get_button():
-            if self.button_callbacks["encoder"]["short"]:
-                self.button_callbacks["encoder"][
-                    "short"
-                ]()  # Call encoder button callback
+        rotation = encoder.get_rotation()
+        if rotation:
+            # The sign picks the slot: False is _DIR_CW, True is _DIR_CCW
+            rotation_callback = encoder_callbacks[rotation < 0]
+            if rotation_callback:
+                rotation_callback(rotation if rotation > 0 else -rotation)  # Call the direction's callback
+
+        # Handle encoder button, reading and clearing the flag in place
+        if encoder.button_pressed:
+            encoder.button_pressed = False
+            encoder_short_callback = button_callbacks[_BTN_ENCODER * 2 + _PT_SHORT]
+            if encoder_short_callback:
+                encoder_short_callback()  # Call encoder button callback
  
         # Handle other buttons
         events = self.button_manager.get_events()
-        for event_type, button_name, duration in events: 
-            print(f"{event_type:12} on {button_name:8}: {duration:4}ms")
-            if event_type == "long_press": 
-                long_press_callback = self.button_callbacks[button_name]["long"]
-                if long_press_callback: 
-                    long_press_callback()
-            elif event_type == "short_press":
-                short_press_callback = self.button_callbacks[button_name]["short"]
-                if short_press_callback: 
-                    short_press_callback()
+        for press_type, button_id, duration in events: 
+            if DEBUG:  # const, so the compiler drops the formatting too
+                print(f"{ButtonManager._TYPES[press_type]:12} on "
+                      f"{ButtonManager._NAMES[button_id]:8}: {duration:4}ms")
+            press_callback = button_callbacks[button_id * 2 + press_type]
+            if press_callback: 
+                press_callback()
             
              
 
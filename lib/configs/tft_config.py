@@ -21,16 +21,26 @@ FEATHERS = 1    # orientation for feathers.py
 
 POWER = Pin(46, Pin.OUT, value=1)
 
+_tft = None  # the one driver instance, created by the first config() call
+
 def config(rotation=0) -> st7789.ST7789:
     """
-    Configures and returns an instance of the ST7789 display driver.
+    Configures and returns the ST7789 display driver.
+
+    The SPI bus and driver are only created on the first call; later calls
+    return the same instance, switched to the requested rotation.
 
     Args:
         rotation (int): The rotation of the display (default: 0).
 
     Returns:
-        ST7789: An instance of the ST7789 display driver.
+        ST7789: The shared ST7789 display driver.
     """
+    global _tft
+
+    if _tft is not None:
+        _tft.rotation(rotation)
+        return _tft
 
     custom_rotations = (
         (0x00, 170, 320, 35, 0, False),
@@ -39,7 +49,7 @@ def config(rotation=0) -> st7789.ST7789:
         (0xA0, 320, 170, 0, 35, False),
     )
 
-    return st7789.ST7789(
+    _tft = st7789.ST7789(
         SPI(2, baudrate=40000000, sck=Pin(TFT_SCLK), mosi=Pin(TFT_MOSI), miso=None),
         170,
         320,
@@ -51,5 +61,4 @@ def config(rotation=0) -> st7789.ST7789:
         rotation=rotation,
         color_order=st7789.BGR,
     )
-
- 
\ No newline at end of file
+    return _tft
@@ -1,6 +1,34 @@
 from core.display.screen import Screen
 from core.display.components import Button, TextInput, VirtualKeyboard, UIComponent, ListView
+from lib.configs import tft_buttons
+import uasyncio as asyncio
 
+# Longest sleep between updates when no input arrives (keeps the cursor blinking)
+IDLE_TIMEOUT_MS = 250
+
+# Shortest time between updates; encoder steps arriving meanwhile add up in
+# the encoder counter and are handled together (~60 updates per second)
+FRAME_MS = 16
+
+
+async def run(screen):
+    """Update the screen whenever input arrives instead of busy polling."""
+    wakeup = asyncio.ThreadSafeFlag()
+    tft_buttons.set_wakeup(wakeup)
+
+    # Bind the per-tick lookups once, outside the loop
+    update = screen.update
+    wait = wakeup.wait
+    wait_for_ms = asyncio.wait_for_ms
+    sleep_ms = asyncio.sleep_ms
+    timeout_error = asyncio.TimeoutError
+    while True:
+        update()
+        await sleep_ms(FRAME_MS)
+        try:
+            await wait_for_ms(wait(), IDLE_TIMEOUT_MS)
+        except timeout_error:
+            pass
 
 
 if __name__ == "__main__":
@@ -9,7 +37,6 @@ if __name__ == "__main__":
     keyboard = VirtualKeyboard(screen.display, component)
     screen.add_component([keyboard, component])
     print(screen._components)
-    while True:
-        screen.update()
+    asyncio.run(run(screen))
 
      
\ No newline at end of file